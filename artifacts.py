@@ -0,0 +1,130 @@
+import logging
+import os
+from data_processing.ml_modeling import load_models
+from interpolation.interpolation import build_grid
+from spatial_processing.visualization import build_colormap
+
+backend_logger = logging.getLogger('backend_logger')
+
+
+def _file_key(path):
+    try:
+        st = os.stat(path)
+        return path, st.st_size, st.st_mtime_ns
+    except OSError:
+        return path, None, None
+
+
+class RegionArtifacts:
+    """Polygony, mřížka a maska jednoho regionu spolu s klíči vstupů, ze kterých byly sestaveny."""
+
+    def __init__(self, name):
+        self.name = name
+        self.images_dir = None
+        self.country = None
+        self.grid = None
+        self.country_key = None
+        self.grid_key = None
+
+
+class RoundArtifacts:
+    """
+    Drží načtené těžké artefakty mezi koly: sdílené (DEM, model, barevná škála) a regionální
+    (polygony, mřížka s maskou). refresh() porovná konfiguraci, ze které byl každý artefakt
+    sestaven, s aktuální a znovu sestaví jen ty, kterých se změna týká.
+    """
+
+    def __init__(self, geo_proc):
+        self.geo_proc = geo_proc
+        self._keys = {}
+        self._countries = {}
+
+        self.elevation_data = None
+        self.transform_matrix = None
+        self.crs = None
+        self.scaler = None
+        self.model = None
+        self.cmap = None
+        self.regions = {}
+
+    def _stale(self, name, key):
+        return self._keys.get(name) != key
+
+    def _country(self, country_file):
+        # Regiony se stejným souborem polygonů (např. různá rozlišení) sdílí jeden GeoDataFrame.
+        key = _file_key(country_file)
+        if key not in self._countries:
+            state = self.geo_proc.load_country_data(country_file)
+            self._countries[key] = self.geo_proc.json_to_geodataframe(state)
+        return key, self._countries[key]
+
+    def _refresh_region(self, region, region_cfg, rebuilt):
+        name = region.name
+        country_key, country = self._country(region_cfg["country_file"])
+        grid_key = (country_key, region_cfg["x_points"], region_cfg["y_points"])
+        if region.grid_key == grid_key:
+            grid = region.grid
+        else:
+            grid = build_grid(country, self.geo_proc, region_cfg["x_points"], region_cfg["y_points"])
+
+        # Region se mění až po úspěšném sestavení všech částí, polygony a maska tak nikdy nejsou rozpárované.
+        if region.country_key != country_key:
+            rebuilt.append(f"{name}.country")
+        if region.grid_key != grid_key:
+            rebuilt.append(f"{name}.grid")
+        region.images_dir = region_cfg["images_dir"]
+        region.country, region.country_key = country, country_key
+        region.grid, region.grid_key = grid, grid_key
+
+    def _refresh_regions(self, config, rebuilt):
+        # Klíče vstupů žijí na objektu regionu, takže region ztracený chybou se příště sestaví celý znovu.
+        region_cfgs = config.get_regions()
+        regions = {}
+        for region_cfg in region_cfgs:
+            name = region_cfg["name"]
+            region = self.regions.get(name) or RegionArtifacts(name)
+            try:
+                self._refresh_region(region, region_cfg, rebuilt)
+            except Exception as e:
+                if region.grid is None:
+                    backend_logger.error(f"Building region {name} failed, region skipped: {e}")
+                    continue
+                backend_logger.error(f"Refreshing region {name} failed, keeping its previous polygons and grid: {e}")
+            regions[name] = region
+
+        configured = {region_cfg["name"] for region_cfg in region_cfgs}
+        for name in self.regions.keys() - configured:
+            backend_logger.info("Region %s removed from configuration.", name)
+        self.regions = regions
+        used = {region.country_key for region in regions.values()}
+        self._countries = {key: gdf for key, gdf in self._countries.items() if key in used}
+
+    def refresh(self, config):
+        paths = config.get_paths()
+        ml_cfg = config.get_ml()
+        vis = config.get_visualization()
+        rebuilt = []
+
+        dem_key = _file_key(paths["dem_tif"])
+        if self._stale("elevation", dem_key):
+            self.elevation_data, self.transform_matrix, self.crs = self.geo_proc.load_elevation_data(paths["dem_tif"])
+            self._keys["elevation"] = dem_key
+            rebuilt.append("elevation")
+
+        self._refresh_regions(config, rebuilt)
+
+        model_key = (_file_key(ml_cfg["scaler_path"]), _file_key(ml_cfg["lstm_path"]))
+        if self._stale("model", model_key):
+            self.scaler, self.model = load_models(ml_cfg["scaler_path"], ml_cfg["lstm_path"])
+            self._keys["model"] = model_key
+            rebuilt.append("model")
+
+        cmap_key = (vis["n_levels"], repr(vis["colormap"]))
+        if self._stale("cmap", cmap_key):
+            self.cmap = build_colormap(vis["n_levels"], vis["colormap"])
+            self._keys["cmap"] = cmap_key
+            rebuilt.append("cmap")
+
+        if rebuilt:
+            backend_logger.info("Rebuilt artifacts: %s", ", ".join(rebuilt))
+        return rebuilt
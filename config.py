@@ -1,14 +1,90 @@
 import os
 import ast
+import copy
 import configparser
+from scheduler import validate_schedule
 
 
 class AppConfig:
+    FILES = {"app": "app.ini.dist", "database": "database.ini.dist", "compute": "compute.ini.dist"}
+
     def __init__(self, config_dir="configs"):
         self.config_dir = config_dir
-        self.app = self._load("app.ini.dist")
-        self.database = self._load("database.ini.dist")
-        self.compute = self._load("compute.ini.dist")
+        self.app = self._load(self.FILES["app"])
+        self.database = self._load(self.FILES["database"])
+        self.compute = self._load(self.FILES["compute"])
+        self.validate()
+        self._mtimes = self._current_mtimes()
+
+    def _current_mtimes(self):
+        return {
+            name: os.path.getmtime(os.path.join(self.config_dir, filename))
+            for name, filename in self.FILES.items()
+        }
+
+    @staticmethod
+    def _sections(cfg):
+        return {name: dict(cfg.items(name, raw=True)) for name in cfg.sections()}
+
+    def reload_if_changed(self):
+        """
+        Znovu načte konfiguraci, pokud se některý soubor změnil.
+        Vrací množinu změněných sekcí ve tvaru "app.grid" apod. (prázdnou, pokud se nic nezměnilo).
+        Nové soubory se před nasazením zvalidují (validate()); při chybě parsování nebo neplatné
+        hodnotě se výjimka propaguje a platí dosavadní konfigurace.
+        """
+        mtimes = self._current_mtimes()
+        if mtimes == self._mtimes:
+            return set()
+
+        loaded = {name: self._load(filename) for name, filename in self.FILES.items()}
+        candidate = copy.copy(self)
+        candidate.app, candidate.database, candidate.compute = loaded["app"], loaded["database"], loaded["compute"]
+        candidate.validate()
+
+        changed = set()
+        for name, cfg in loaded.items():
+            old = self._sections(getattr(self, name))
+            new = self._sections(cfg)
+            for section in old.keys() | new.keys():
+                if old.get(section) != new.get(section):
+                    changed.add(f"{name}.{section}")
+
+        self.app, self.database, self.compute = loaded["app"], loaded["database"], loaded["compute"]
+        self._mtimes = mtimes
+        return changed
+
+    def validate(self):
+        """Projde všechny gettery a zkontroluje rozsahy; při neplatné konfiguraci vyhodí ValueError."""
+        try:
+            self.get_logging_config()
+            self.get_paths()
+            self.get_regions()
+            self.get_visualization()
+            self.get_ml()
+            self.get_influx_config("read")
+            self.get_influx_config("write")
+            self.get_interpolation_config()
+            self.get_location()
+            sch = self.get_scheduler_config()
+            cache = self.get_cache_config()
+            workers = self.get_worker_config()
+            metadata = self.get_metadata_config()
+        except (KeyError, ValueError, configparser.Error) as e:
+            raise ValueError(f"Neplatná konfigurace: {e!r}") from e
+
+        validate_schedule(sch["interval_minutes"] * 60, sch["overrun_policy"])
+        if sch["interval_minutes"] * 60 < 1:
+            raise ValueError("scheduler.interval_minutes musí odpovídat alespoň jedné sekundě")
+        if cache["max_entries"] < 1:
+            raise ValueError("cache.max_entries musí být alespoň 1")
+        if metadata["known_ip_ttl_hours"] <= 0:
+            raise ValueError("metadata.known_ip_ttl_hours musí být kladný")
+        if workers["max_workers"] < 1:
+            raise ValueError("workers.max_workers musí být alespoň 1")
+        for region in self.get_regions():
+            if region["x_points"] < 2 or region["y_points"] < 2:
+                raise ValueError(f"Region {region['name']}: x_points a y_points musí být alespoň 2")
 
     def _load(self, filename):
         cfg = configparser.ConfigParser()
@@ -38,6 +114,36 @@ class AppConfig:
             "saved_grids_dir": p.get("saved_grids_dir", "saved_grids"),
         }
 
+    def get_regions(self):
+        """
+        Regiony ze sekcí [region:<název>] v app.ini.dist. Chybějící klíče se berou z [paths] a [grid];
+        bez jediné regionální sekce vrací jeden implicitní region "default" s původním chováním.
+        """
+        paths = self.get_paths()
+        grid = self.get_grid_config()
+        regions = []
+        for section in self.app.sections():
+            if not section.startswith("region:"):
+                continue
+            r = self.app[section]
+            name = section.split(":", 1)[1].strip()
+            regions.append({
+                "name": name,
+                "country_file": r.get("country_file", paths["country_file"]),
+                "images_dir": r.get("images_dir", os.path.join(paths["images_dir"], name)),
+                "x_points": r.getint("x_points", grid["x_points"]),
+                "y_points": r.getint("y_points", grid["y_points"]),
+            })
+        if not regions:
+            regions.append({
+                "name": "default",
+                "country_file": paths["country_file"],
+                "images_dir": paths["images_dir"],
+                "x_points": grid["x_points"],
+                "y_points": grid["y_points"],
+            })
+        return regions
+
     def get_visualization(self):
         vis = self.app["visualization"] if "visualization" in self.app else {}
         cmap_literal = vis.get("colormap", "[]")
@@ -58,6 +164,22 @@ class AppConfig:
             "scaler_path": ml.get("scaler_path", "neural/scaler.joblib"),
         }
 
+    def get_scheduler_config(self):
+        sch = self.app["scheduler"] if "scheduler" in self.app else {}
+        return {
+            "interval_minutes": float(sch.get("interval_minutes", "60")),
+            "overrun_policy": sch.get("overrun_policy", "skip"),
+            "align": str(sch.get("align", "true")).strip().lower() in ("1", "true", "yes", "on"),
+        }
+
+    def get_cache_config(self):
+        c = self.app["cache"] if "cache" in self.app else {}
+        return {
+            "enabled": str(c.get("enabled", "true")).strip().lower() in ("1", "true", "yes", "on"),
+            "cache_dir": c.get("cache_dir", "round_cache"),
+            "max_entries": int(c.get("max_entries", "5")),
+        }
+
     # --- DATABASE / MYSQL ---
     def get_database_credentials(self):
         db = self.database["mysql"]
@@ -68,6 +190,12 @@ class AppConfig:
             "password": db.get("password"),
         }
 
+    def get_metadata_config(self):
+        md = self.database["metadata"] if "metadata" in self.database else {}
+        return {
+            "known_ip_ttl_hours": float(md.get("known_ip_ttl_hours", "24")),
+        }
+
     def get_mysql_url(self):
         c = self.get_database_credentials()
         return f"{c['driver']}://{c['user']}:{c['password']}@{c['host']}:{c['port']}"
@@ -116,6 +244,12 @@ class AppConfig:
             "mask_resolution_safe": g.getboolean("mask_resolution_safe", True),
         }
 
+    def get_worker_config(self):
+        w = self.compute["workers"] if "workers" in self.compute else {}
+        return {
+            "max_workers": int(w.get("max_workers", "2")),
+        }
+
     def get_interpolation_config(self):
         itp = self.compute["interpolation"]
         return {
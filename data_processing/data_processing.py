@@ -1,11 +1,15 @@
 import logging
 from data_processing.ml_modeling import temperature_predict
 from interpolation.interpolation import spatial_interpolation
-from database_operations.influx_manager import get_data, write_predictions
+from data_processing.ingest import ingest_round
+from data_processing.round_cache import RoundCache, compute_fingerprint, render_key
+from database_operations.influx_manager import write_predictions
 from spatial_processing.visualization import map_plotting
+from scheduler import next_boundary
 import pandas as pd
 import datetime
 import gc
+import os
 import traceback
 import numpy as np
 from rasterio.transform import Affine
@@ -14,11 +18,29 @@ from pyproj import Transformer
 
 backend_logger = logging.getLogger("backend_logger")
 first_run = True
+_round_cache = None
 
+MEASUREMENT_COLUMNS = ("Temperature_MW", "Signal")
 
-def collect_data_summary(df):
 
-    image_time = pd.to_datetime(df["Time"].iloc[0]).ceil('h')
+def get_round_cache(config):
+    global _round_cache
+    cache_cfg = config.get_cache_config()
+    if not cache_cfg["enabled"]:
+        return None
+    if _round_cache is None or _round_cache.cache_dir != cache_cfg["cache_dir"]:
+        _round_cache = RoundCache(cache_cfg["cache_dir"], cache_cfg["max_entries"])
+    elif _round_cache.max_entries != cache_cfg["max_entries"]:
+        _round_cache.max_entries = cache_cfg["max_entries"]
+        _round_cache.evict()
+    return _round_cache
+
+
+def collect_data_summary(df, slot_time=None, interval_seconds=3600):
+    # Čas snímku je slot plánovače; bez něj se čas dat zaokrouhlí nahoru na stejnou mřížku (od půlnoci UTC).
+    if slot_time is None:
+        slot_time = next_boundary(pd.to_datetime(df["Time"].iloc[0], utc=True).to_pydatetime(), interval_seconds)
+    image_time = pd.Timestamp(slot_time)
     image_hour = image_time.strftime("%Y-%m-%d_%H%M")
     image_name = f"{image_hour}.png"
 
@@ -37,12 +59,17 @@ def prepare_data(
         technologies,
         sides
 ) -> pd.DataFrame:
-    df["Azimuth"] = azimuths
-    df["Latitude"] = latitudes
-    df["Longitude"] = longitudes
-    df["Link_ID"] = links
-    df["Technology"] = technologies
-    df["Side"] = sides
+    # float32 souřadnice: odchylka ~1e-6° (řádově 10 cm) proti float64, scaler i kriging dostávají zaokrouhlené hodnoty.
+    df["Azimuth"] = np.asarray(azimuths, dtype=np.float32)
+    df["Latitude"] = np.asarray(latitudes, dtype=np.float32)
+    df["Longitude"] = np.asarray(longitudes, dtype=np.float32)
+    df["Link_ID"] = pd.Categorical(links)
+    df["Technology"] = pd.Categorical(technologies)
+    df["Side"] = pd.Categorical(sides)
+    df["IP"] = df["IP"].astype("category")
+    for col in MEASUREMENT_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype(np.float32)
 
     df = df.dropna(subset=["Latitude", "Longitude", "Time"])
 
@@ -67,39 +94,101 @@ def prepare_data(
 
     df["Hour"] = df["Time"].dt.hour.astype(np.int16)
     df["Day"] = df["Time"].dt.dayofyear.astype(np.int16)
+    if "sun" in df.columns:
+        df["sun"] = df["sun"].astype(np.int8)
     return df
 
 
-def process_data_round(config, db_ops, geo_proc, czech_rep, elevation_data, transform_matrix, crs):
+def interpolate_region(df, config, geo_proc, artifacts, region):
+    itp = config.get_interpolation_config()
+    return spatial_interpolation(
+        df, region.country, geo_proc, artifacts.elevation_data, artifacts.transform_matrix, artifacts.crs,
+        variogram_model=itp["variogram_model"],
+        nlags=itp["nlags"],
+        regression_model_type=itp["regression_model"],
+        grid=region.grid
+    )
+
+
+def compute_round(df, config, geo_proc, artifacts, pool):
+    """
+    Inference proběhne jednou nad sdílenými daty, kriging pro každý region ve sdíleném poolu.
+    Vrací predikce a {název regionu: (grid_x, grid_y, grid_z)} pro regiony, které se podařilo spočítat.
+    """
+    ml_cfg = config.get_ml()
+    df = temperature_predict(df, scaler_path=ml_cfg["scaler_path"], lstm_model_path=ml_cfg["lstm_path"],
+                             scaler=artifacts.scaler, model=artifacts.model)
+
+    futures = {
+        name: pool.submit(interpolate_region, df, config, geo_proc, artifacts, region)
+        for name, region in artifacts.regions.items()
+    }
+    grids = {}
+    for name, future in futures.items():
+        try:
+            grids[name] = future.result()
+        except Exception as e:
+            backend_logger.error(f"Interpolation failed for region {name}: {e}")
+    return df, grids
+
+
+def plot_regions(grids, config, artifacts, image_name, only_missing=False):
+    # pyplot není thread-safe, vykresluje se proto sériově v hlavním vlákně.
+    for name, (grid_x, grid_y, grid_z) in grids.items():
+        region = artifacts.regions.get(name)
+        if region is None:
+            continue
+        if only_missing and os.path.exists(os.path.join(region.images_dir, image_name)):
+            continue
+        try:
+            map_plotting(grid_x, grid_y, grid_z, region.country, image_name, config,
+                         cmap=artifacts.cmap, save_dir=region.images_dir)
+        except Exception as e:
+            backend_logger.error(f"Plotting failed for region {name}: {e}")
+
+
+def process_data_round(config, db_ops, geo_proc, artifacts, pool, slot_time=None):
     global first_run
     start_datetime = datetime.datetime.now().strftime("%Y-%m-%d %H:%M")
     backend_logger.info(f"Calculation started on {start_datetime}")
 
     try:
 
-        df = get_data(config)
-        latitudes, longitudes, azimuths, links, technologies, sides = db_ops.get_metadata(df)
-        df = prepare_data(df, elevation_data, transform_matrix, crs, latitudes, longitudes, azimuths, links,
-                          technologies,
-                          sides)
-        unique_links_list, image_name, image_time = collect_data_summary(df)
-
-        ml_cfg = config.get_ml()
-        df = temperature_predict(df, scaler_path=ml_cfg["scaler_path"], lstm_model_path=ml_cfg["lstm_path"])
-
-        itp = config.get_interpolation_config()
-        grid = config.get_grid_config()
-        grid_x, grid_y, grid_z = spatial_interpolation(
-            df, czech_rep, geo_proc, elevation_data, transform_matrix, crs,
-            variogram_model=itp["variogram_model"],
-            nlags=itp["nlags"],
-            regression_model_type=itp["regression_model"],
-            grid_x_points=grid["x_points"],
-            grid_y_points=grid["y_points"]
-        )
-
-        write_predictions(df, config)
-        map_plotting(grid_x, grid_y, grid_z, czech_rep, image_name, config)
+        df, metadata = ingest_round(config, db_ops)
+        latitudes, longitudes, azimuths, links, technologies, sides = metadata
+        df = prepare_data(df, artifacts.elevation_data, artifacts.transform_matrix, artifacts.crs,
+                          latitudes, longitudes, azimuths, links, technologies, sides)
+        sch = config.get_scheduler_config()
+        image_name, image_time = collect_data_summary(df, slot_time, sch["interval_minutes"] * 60)
+
+        cache = get_round_cache(config)
+        fingerprint = compute_fingerprint(df, config) if cache is not None else None
+        rendered = render_key(config) if cache is not None else None
+        cached = cache.load(fingerprint) if cache is not None else None
+        if cached is not None:
+            grids, cached_render = cached
+            if cached_render == rendered:
+                backend_logger.info(f"Inputs unchanged (fingerprint {fingerprint[:12]}), reusing cached grids.")
+                plot_regions(grids, config, artifacts, image_name, only_missing=True)
+            else:
+                backend_logger.info(f"Only visualization settings changed (fingerprint {fingerprint[:12]}), "
+                                    f"re-plotting from cached grids.")
+                plot_regions(grids, config, artifacts, image_name)
+                cache.mark_rendered(fingerprint, rendered)
+        else:
+            df, grids = compute_round(df, config, geo_proc, artifacts, pool)
+            written = write_predictions(df, config)
+            plot_regions(grids, config, artifacts, image_name)
+            # Bez úspěšného zápisu se nekešuje, jinak by shodný otisk v dalším kole zápis přeskočil.
+            # Stejně tak bez mřížek všech nakonfigurovaných regionů (i těch, jejichž sestavení selhalo).
+            configured = {region_cfg["name"] for region_cfg in config.get_regions()}
+            if cache is not None and not written:
+                backend_logger.warning("Predictions were not written to InfluxDB, round result not cached.")
+            elif cache is not None and set(grids) == configured:
+                cache.store(fingerprint, grids, rendered)
+            elif cache is not None:
+                backend_logger.warning("Regions missing from this round (%s), round result not cached.",
+                                       ", ".join(sorted(configured - set(grids))))
     except Exception as e:
         backend_logger.error(f"Error during data processing round: {e}\n{traceback.format_exc()}")
 
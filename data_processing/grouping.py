@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+
+INT64_MAX = np.iinfo(np.int64).max
+
+GROUP_COLUMNS = ["Hour", "IP", "Latitude", "Longitude", "Technology", "Side", "Elevation", "Link_ID", "Time"]
+
+
+def group_key(df, columns):
+    """
+    Složí klíče `columns` do jednoho int64 kódu skupiny.
+    Kódy sloupců jsou seřazené, takže pořadí klíčů odpovídá lexikografickému pořadí hodnot (jako groupby(sort=True)).
+    Řádky s chybějící hodnotou v libovolném klíči dostanou -1 (stejně jako dropna v groupby).
+    """
+    key = np.zeros(len(df), dtype=np.int64)
+    key_max = 0
+    valid = np.ones(len(df), dtype=bool)
+    for col in columns:
+        s = df[col]
+        if isinstance(s.dtype, pd.CategoricalDtype):
+            codes, n = s.cat.codes.to_numpy(np.int64), len(s.cat.categories)
+        else:
+            codes, uniques = pd.factorize(s, sort=True)
+            n = len(uniques)
+        valid &= codes >= 0
+        if key_max * (n + 1) + n > INT64_MAX:
+            # Přečíslování jen když by další násobení přeteklo; sort=True zachová pořadí klíčů.
+            key, uniques = pd.factorize(key, sort=True)
+            key_max = len(uniques) - 1
+        key = key * (n + 1) + (codes + 1)
+        key_max = key_max * (n + 1) + n
+    return np.where(valid, key, -1)
+
+
+def median_by_key(df, columns, value_col):
+    """Medián `value_col` po skupinách `columns`; výsledek odpovídá df.groupby(columns)[value_col].median()."""
+    key = group_key(df, columns)
+    rows = np.flatnonzero(key >= 0)
+    keys = key[rows]
+    # np.unique i groupby(sort=True) vrací skupiny vzestupně podle klíče, tedy ve stejném pořadí.
+    _, first = np.unique(keys, return_index=True)
+    medians = pd.Series(df[value_col].to_numpy()[rows]).groupby(keys, sort=True).median()
+    out = df.iloc[rows[first]][columns].reset_index(drop=True)
+    out[value_col] = medians.to_numpy()
+    return out
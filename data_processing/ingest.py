@@ -0,0 +1,34 @@
+import asyncio
+import logging
+import time
+from database_operations.influx_manager import get_data_async
+
+backend_logger = logging.getLogger("backend_logger")
+
+
+async def _ingest(config, db_ops):
+    t0 = time.perf_counter()
+    expected_ips = sorted(db_ops.known_ips)
+
+    # Metadata pro očekávané IP se obnovují v pracovním vlákně, zatímco běží dotaz do Influxu.
+    df, refreshed = await asyncio.gather(
+        get_data_async(config),
+        asyncio.to_thread(db_ops.fetch_metadata, expected_ips, True),
+    )
+    t_io = time.perf_counter() - t0
+
+    # IP, které v minulých kolech nebyly, se dotáhnou tady (cache miss v get_metadata).
+    metadata = db_ops.get_metadata(df) if not df.empty else ([], [], [], [], [], [])
+    backend_logger.debug(
+        "ingest: expected=%d, refreshed=%d, io=%.3fs, total=%.3fs",
+        len(expected_ips), len(refreshed), t_io, time.perf_counter() - t0
+    )
+    return df, metadata
+
+
+def ingest_round(config, db_ops):
+    """
+    Načte měření z Influxu a metadata spojů z MySQL souběžně.
+    Vrací (df, (latitudes, longitudes, azimuths, links, technologies, sides)).
+    """
+    return asyncio.run(_ingest(config, db_ops))
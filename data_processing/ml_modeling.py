@@ -1,21 +1,21 @@
 import joblib
 from tensorflow.keras.models import load_model
+from data_processing.grouping import GROUP_COLUMNS, median_by_key
 
 
-def temperature_predict(df, scaler_path, lstm_model_path):
+def load_models(scaler_path, lstm_model_path):
+    return joblib.load(scaler_path), load_model(lstm_model_path, compile=False)
+
+
+def temperature_predict(df, scaler_path, lstm_model_path, scaler=None, model=None):
     col_order = ['Temperature_MW', 'sun', 'Hour', 'Day', 'Signal', 'Azimuth', 'Latitude', 'Longitude', 'Technology',
                  'Elevation']
     X = df[col_order]
-    scaler = joblib.load(scaler_path)
+    if scaler is None or model is None:
+        scaler, model = load_models(scaler_path, lstm_model_path)
     X_scaled = scaler.transform(X)
     X_reshaped = X_scaled.reshape((X_scaled.shape[0], X_scaled.shape[1], 1))
-    model = load_model(lstm_model_path, compile=False)
     predicted_temperatures = model.predict(X_reshaped).flatten()
     df["Predicted_Temperature"] = predicted_temperatures
-    df = (
-        df.groupby(["Hour", "IP", "Latitude", "Longitude", "Technology", "Side", "Elevation", "Link_ID", "Time"])[
-            "Predicted_Temperature"]
-        .median()
-        .reset_index()
-    )
+    df = median_by_key(df, GROUP_COLUMNS, "Predicted_Temperature")
     return df
@@ -0,0 +1,151 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import uuid
+import numpy as np
+import pandas as pd
+
+backend_logger = logging.getLogger("backend_logger")
+
+_file_digests = {}
+
+
+def file_digest(path):
+    """SHA-256 souboru; přepočítá se jen při změně velikosti nebo mtime."""
+    st = os.stat(path)
+    key = (os.path.abspath(path), st.st_size, st.st_mtime_ns)
+    digest = _file_digests.get(key)
+    if digest is None:
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+        digest = h.hexdigest()
+        _file_digests[key] = digest
+    return digest
+
+
+def frame_digest(df):
+    h = hashlib.sha256()
+    h.update(json.dumps([(str(c), str(t)) for c, t in df.dtypes.items()]).encode("utf-8"))
+    h.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def _optional_digest(path):
+    return file_digest(path) if path and os.path.exists(path) else None
+
+
+def _hash_json(*parts):
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(json.dumps(part, sort_keys=True, default=str).encode("utf-8"))
+    return h.hexdigest()
+
+
+def compute_fingerprint(df, config):
+    """
+    Otisk vstupů výpočtu: obsah DataFrame, hashe modelu, DEM a polygonů regionů,
+    nastavení interpolace, velikosti mřížek a cíl zápisu predikcí.
+    """
+    ml_cfg = config.get_ml()
+    relevant = {
+        "ml": ml_cfg,
+        "models": {name: _optional_digest(ml_cfg[name]) for name in ("scaler_path", "lstm_path")},
+        "interpolation": config.get_interpolation_config(),
+        "dem": _optional_digest(config.get_paths()["dem_tif"]),
+        "regions": [
+            (r["name"], r["x_points"], r["y_points"], _optional_digest(r["country_file"]))
+            for r in config.get_regions()
+        ],
+        "influx_write": {k: v for k, v in config.get_influx_config("write").items() if k != "token"},
+    }
+    return _hash_json(frame_digest(df), relevant)
+
+
+def render_key(config):
+    """Klíč vykreslení: barevná škála a cílové adresáře obrázků; jeho změna nevyžaduje nový výpočet."""
+    return _hash_json({
+        "visualization": config.get_visualization(),
+        "images_dirs": {r["name"]: r["images_dir"] for r in config.get_regions()},
+    })
+
+
+class RoundCache:
+    """
+    Diskový cache mřížek regionů z posledních kol, klíčovaný otiskem vstupů výpočtu.
+    Ke každému záznamu patří klíč vykreslení, se kterým byly naposledy vykresleny obrázky.
+    Drží nejvýše max_entries záznamů, nejdéle nepoužité se mažou.
+    """
+
+    def __init__(self, cache_dir, max_entries=5):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _entry_dir(self, fingerprint):
+        return os.path.join(self.cache_dir, fingerprint)
+
+    def load(self, fingerprint):
+        entry = self._entry_dir(fingerprint)
+        if not os.path.isdir(entry):
+            return None
+        try:
+            with open(os.path.join(entry, "regions.json"), "r", encoding="utf-8") as f:
+                names = json.load(f)
+            with open(os.path.join(entry, "render.json"), "r", encoding="utf-8") as f:
+                rendered = json.load(f)
+            grids = {}
+            with np.load(os.path.join(entry, "grids.npz")) as npz:
+                for i, name in enumerate(names):
+                    grids[name] = (npz[f"{i}_x"], npz[f"{i}_y"], npz[f"{i}_z"])
+        except Exception as e:
+            backend_logger.warning(f"Poškozený záznam cache {fingerprint[:12]}, mažu: {e}")
+            shutil.rmtree(entry, ignore_errors=True)
+            return None
+        os.utime(entry)
+        return grids, rendered
+
+    def store(self, fingerprint, grids, rendered):
+        """grids: {název regionu: (grid_x, grid_y, grid_z)}, rendered: klíč vykreslení obrázků"""
+        entry = self._entry_dir(fingerprint)
+        tmp = os.path.join(self.cache_dir, f".tmp-{uuid.uuid4().hex}")
+        try:
+            os.makedirs(tmp)
+            names = list(grids)
+            arrays = {}
+            for i, name in enumerate(names):
+                arrays[f"{i}_x"], arrays[f"{i}_y"], arrays[f"{i}_z"] = grids[name]
+            np.savez(os.path.join(tmp, "grids.npz"), **arrays)
+            with open(os.path.join(tmp, "regions.json"), "w", encoding="utf-8") as f:
+                json.dump(names, f)
+            with open(os.path.join(tmp, "render.json"), "w", encoding="utf-8") as f:
+                json.dump(rendered, f)
+            if os.path.isdir(entry):
+                shutil.rmtree(entry)
+            os.replace(tmp, entry)
+        except Exception as e:
+            backend_logger.warning(f"Uložení výsledku kola do cache selhalo: {e}")
+            shutil.rmtree(tmp, ignore_errors=True)
+            return
+        self.evict()
+
+    def mark_rendered(self, fingerprint, rendered):
+        try:
+            with open(os.path.join(self._entry_dir(fingerprint), "render.json"), "w", encoding="utf-8") as f:
+                json.dump(rendered, f)
+        except OSError as e:
+            backend_logger.warning(f"Aktualizace klíče vykreslení v cache selhala: {e}")
+
+    def evict(self):
+        entries = [
+            os.path.join(self.cache_dir, name)
+            for name in os.listdir(self.cache_dir)
+            if not name.startswith(".") and os.path.isdir(os.path.join(self.cache_dir, name))
+        ]
+        entries.sort(key=os.path.getmtime, reverse=True)
+        for stale in entries[self.max_entries:]:
+            shutil.rmtree(stale, ignore_errors=True)
+            backend_logger.debug("Round cache: evicted %s", os.path.basename(stale))
@@ -1,6 +1,7 @@
 import logging
 from influxdb_client import InfluxDBClient, Point
 from influxdb_client.client.write_api import SYNCHRONOUS
+from influxdb_client.client.influxdb_client_async import InfluxDBClientAsync
 import pandas as pd
 from astral.sun import sun
 from astral import LocationInfo
@@ -24,65 +25,67 @@ def is_daylight(ts_utc, lat, lng, local_tz_str):
     return 1 if sunrise_utc <= ts_utc <= sunset_utc else 0
 
 
-def get_data(config):
-    read_cfg = config.get_influx_config("read")
-    loc = config.get_location()
+def _build_read_query(read_cfg):
+    meas_filter = " or ".join([f'r["_measurement"] == "{m}"' for m in read_cfg["measurements"]])
+    fields_filter = " or ".join([f'r["_field"] == "{f}"' for f in read_cfg["fields"]])
+    return f'''
+        from(bucket: "{read_cfg["bucket"]}")
+          |> range(start: {read_cfg["range"]})
+          |> filter(fn: (r) => {meas_filter})
+          |> filter(fn: (r) => {fields_filter})
+          |> aggregateWindow(every: {read_cfg["window"]}, fn: mean)
+          |> group(columns: ["_measurement", "_field", "{read_cfg["tag_device"]}"])
+        '''
+
 
-    fields = read_cfg["fields"]
+def _tables_to_frame(result, read_cfg, loc):
     field_temp = read_cfg["field_temperature"]
     field_sig = read_cfg["field_signal"]
     device_tag = read_cfg["tag_device"]
-    measurements = read_cfg["measurements"]
 
-    meas_filter = " or ".join([f'r["_measurement"] == "{m}"' for m in measurements])
-    fields_filter = " or ".join([f'r["_field"] == "{f}"' for f in fields])
+    data = [
+        {
+            "Time": rec.get_time(),
+            "Measurement": rec.values["_field"],
+            "Value": rec.get_value(),
+            "Device": rec.values[device_tag],
+        }
+        for table in result for rec in table.records
+    ]
+
+    df = pd.DataFrame(data)
+    if df.empty:
+        backend_logger.info("Influx vrátil prázdná data.")
+        return df
+
+    df_pivot = df.pivot_table(
+        index=["Time", "Device"], columns="Measurement", values="Value"
+    ).reset_index()
+
+    df_pivot["Time"] = pd.to_datetime(df_pivot["Time"], utc=True)
+    df_pivot["Unix"] = df_pivot["Time"].astype("int64") // 10 ** 9
+    if field_temp in df_pivot.columns:
+        df_pivot.rename(columns={field_temp: "Temperature_MW"}, inplace=True)
+    if field_sig in df_pivot.columns:
+        df_pivot.rename(columns={field_sig: "Signal"}, inplace=True)
+
+    df_pivot["sun"] = df_pivot["Time"].apply(
+        lambda t: is_daylight(t, loc["lat"], loc["lng"], loc["tz"])
+    )
+    return df_pivot.rename(columns={"Device": "IP"})
+
+
+async def get_data_async(config):
+    read_cfg = config.get_influx_config("read")
+    loc = config.get_location()
 
     try:
-        with InfluxDBClient(url=read_cfg["url"], token=read_cfg["token"]) as client:
-            query = f'''
-                from(bucket: "{read_cfg["bucket"]}")
-                  |> range(start: {read_cfg["range"]})
-                  |> filter(fn: (r) => {meas_filter})
-                  |> filter(fn: (r) => {fields_filter})
-                  |> aggregateWindow(every: {read_cfg["window"]}, fn: mean)
-                  |> group(columns: ["_measurement", "_field", "{device_tag}"])
-                '''
-            result = client.query_api().query(org=read_cfg["org"], query=query)
-
-            data = [
-                {
-                    "Time": rec.get_time(),
-                    "Measurement": rec.values["_field"],
-                    "Value": rec.get_value(),
-                    "Device": rec.values[device_tag],
-                }
-                for table in result for rec in table.records
-            ]
-
-            df = pd.DataFrame(data)
-            if df.empty:
-                backend_logger.info("Influx vrátil prázdná data.")
-                return df
-
-            df_pivot = df.pivot_table(
-                index=["Time", "Device"], columns="Measurement", values="Value"
-            ).reset_index()
-
-            df_pivot["Time"] = pd.to_datetime(df_pivot["Time"], utc=True)
-            df_pivot["Unix"] = df_pivot["Time"].astype("int64") // 10 ** 9
-            if field_temp in df_pivot.columns:
-                df_pivot.rename(columns={field_temp: "Temperature_MW"}, inplace=True)
-            if field_sig in df_pivot.columns:
-                df_pivot.rename(columns={field_sig: "Signal"}, inplace=True)
-
-            df_pivot["sun"] = df_pivot["Time"].apply(
-                lambda t: is_daylight(t, loc["lat"], loc["lng"], loc["tz"])
-            )
-            df_final = df_pivot.rename(columns={"Device": "IP"})
-            return df_final
+        async with InfluxDBClientAsync(url=read_cfg["url"], token=read_cfg["token"], org=read_cfg["org"]) as client:
+            result = await client.query_api().query(query=_build_read_query(read_cfg), org=read_cfg["org"])
+            return _tables_to_frame(result, read_cfg, loc)
 
     except Exception as e:
-        backend_logger.warning(f"Influx get_data selhal: {e}")
+        backend_logger.warning(f"Influx get_data_async selhal: {e}")
 
     return pd.DataFrame()
 
@@ -6,10 +6,82 @@ backend_logger = logging.getLogger('backend_logger')
 
 
 class DatabaseOperations:
-    def __init__(self, engine):
+    def __init__(self, engine, known_ip_ttl=24 * 3600, clock=time.monotonic):
         self.engine = engine
         self.Session = sessionmaker(bind=self.engine)
         self._ip_meta_cache = {}
+        # IP -> monotónní čas, kdy byla naposledy v datech; po known_ip_ttl sekundách bez výskytu se zapomene.
+        self._last_seen = {}
+        self.known_ip_ttl = known_ip_ttl
+        self.clock = clock
+
+    @property
+    def known_ips(self):
+        return set(self._last_seen)
+
+    def _forget(self, ips):
+        for ip in ips:
+            self._ip_meta_cache.pop(ip, None)
+            self._last_seen.pop(ip, None)
+
+    def fetch_metadata(self, ips, evict_missing=False):
+        """
+        Načte (nebo obnoví) metadata spojů pro zadané IP a uloží je do cache.
+        S evict_missing=True se IP, které dotaz nevrátil (spoj zmizel z DB), z cache odstraní.
+        Bezpečné pro volání z pracovního vlákna souběžně se čtením z Influxu.
+        """
+        fetched = {}
+        if not ips:
+            return fetched
+
+        try:
+            with self.Session() as session:
+                stmt = text("""
+                    SELECT
+                        l.ID            AS link_id,
+                        l.technology    AS technology,
+                        x.ip            AS ip,
+                        x.side          AS side,
+                        x.site_id       AS site_id,
+                        x.azimuth       AS azimuth,
+                        s.X_coordinate  AS lon,
+                        s.Y_coordinate  AS lat
+                    FROM cml_metadata.links l
+                    JOIN (
+                        SELECT ID, IP_address_A AS ip, 'A' AS side, site_A AS site_id, azimuth_A AS azimuth FROM cml_metadata.links
+                        UNION ALL
+                        SELECT ID, IP_address_B AS ip, 'B' AS side, site_B AS site_id, azimuth_B AS azimuth FROM cml_metadata.links
+                    ) x ON x.ID = l.ID
+                    JOIN cml_metadata.sites s ON s.id = x.site_id
+                    WHERE x.ip IN :ips
+                """).bindparams(bindparam("ips", expanding=True))
+
+                result = session.execute(stmt, {"ips": list(ips)}).all()
+
+                for r in result:
+                    m = r._mapping
+                    rec = {
+                        "link_id": m["link_id"],
+                        "technology": m["technology"],
+                        "ip": m["ip"],
+                        "side": m["side"],
+                        "site_id": m["site_id"],
+                        "azimuth": m["azimuth"],
+                        "lon": m["lon"],
+                        "lat": m["lat"],
+                    }
+                    fetched[rec["ip"]] = rec
+                    self._ip_meta_cache[rec["ip"]] = rec
+
+            if evict_missing:
+                gone = [ip for ip in ips if ip not in fetched]
+                if gone:
+                    self._forget(gone)
+                    backend_logger.info(f"Metadata for {len(gone)} IPs no longer in DB, evicted from cache.")
+        except Exception as e:
+            backend_logger.error(f"Error during bulk metadata fetch: {e}")
+
+        return fetched
 
     def get_metadata(self, df):
         t0 = time.perf_counter()
@@ -26,48 +98,7 @@ class DatabaseOperations:
         cached = {ip: self._ip_meta_cache[ip] for ip in unique_ips if ip in self._ip_meta_cache}
         missing = [ip for ip in unique_ips if ip not in cached]
 
-        fetched = {}
-        if missing:
-            try:
-                with self.Session() as session:
-                    stmt = text("""
-                        SELECT
-                            l.ID            AS link_id,
-                            l.technology    AS technology,
-                            x.ip            AS ip,
-                            x.side          AS side,
-                            x.site_id       AS site_id,
-                            x.azimuth       AS azimuth,
-                            s.X_coordinate  AS lon,
-                            s.Y_coordinate  AS lat
-                        FROM cml_metadata.links l
-                        JOIN (
-                            SELECT ID, IP_address_A AS ip, 'A' AS side, site_A AS site_id, azimuth_A AS azimuth FROM cml_metadata.links
-                            UNION ALL
-                            SELECT ID, IP_address_B AS ip, 'B' AS side, site_B AS site_id, azimuth_B AS azimuth FROM cml_metadata.links
-                        ) x ON x.ID = l.ID
-                        JOIN cml_metadata.sites s ON s.id = x.site_id
-                        WHERE x.ip IN :ips
-                    """).bindparams(bindparam("ips", expanding=True))
-
-                    result = session.execute(stmt, {"ips": missing}).all()
-
-                    for r in result:
-                        m = r._mapping
-                        rec = {
-                            "link_id": m["link_id"],
-                            "technology": m["technology"],
-                            "ip": m["ip"],
-                            "side": m["side"],
-                            "site_id": m["site_id"],
-                            "azimuth": m["azimuth"],
-                            "lon": m["lon"],
-                            "lat": m["lat"],
-                        }
-                        fetched[rec["ip"]] = rec
-                        self._ip_meta_cache[rec["ip"]] = rec
-            except Exception as e:
-                backend_logger.error(f"Error during bulk metadata fetch: {e}")
+        fetched = self.fetch_metadata(missing)
 
         lookup = {**cached, **fetched}
 
@@ -92,6 +123,15 @@ class DatabaseOperations:
             sides.append(meta["side"])
             devices += 1
 
+        now = self.clock()
+        for ip in unique_ips:
+            if ip in lookup:
+                self._last_seen[ip] = now
+        expired = [ip for ip, seen in self._last_seen.items() if now - seen >= self.known_ip_ttl]
+        if expired:
+            self._forget(expired)
+            backend_logger.debug("get_metadata: %d IPs absent for %.0fs, forgotten.", len(expired), self.known_ip_ttl)
+
         if to_drop:
             df.drop(index=to_drop, inplace=True)
             df.reset_index(drop=True, inplace=True)
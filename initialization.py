@@ -1,27 +1,34 @@
+from concurrent.futures import ThreadPoolExecutor
 from sqlalchemy import create_engine
 from database_operations.sql_manager import DatabaseOperations
 from spatial_processing.geographical_processing import GeographicalProcessing
-from datetime import datetime, timedelta
-from time import sleep
+from scheduler import RoundScheduler
+from artifacts import RoundArtifacts
 
 
+def create_scheduler(config):
+    sch = config.get_scheduler_config()
+    return RoundScheduler(
+        interval_seconds=sch["interval_minutes"] * 60,
+        overrun_policy=sch["overrun_policy"],
+        align=sch["align"],
+    )
+
+
+def create_worker_pool(config):
+    return ThreadPoolExecutor(max_workers=config.get_worker_config()["max_workers"], thread_name_prefix="region")
 
-def wait_for_next_hour():
-    now = datetime.now()
-    next_hour = (now + timedelta(hours=1)).replace(minute=0, second=0, microsecond=0)
-    sleep((next_hour - now).seconds)
 
 def initialize_app(config):
     db_config = config.get_database_credentials()
-    paths = config.get_paths()
 
     engine = create_engine(
         f"mysql://{db_config['user']}:{db_config['password']}@{db_config['host']}:{db_config['port']}"
     )
-    db_ops = DatabaseOperations(engine)
+    db_ops = DatabaseOperations(engine, known_ip_ttl=config.get_metadata_config()["known_ip_ttl_hours"] * 3600)
     geo_proc = GeographicalProcessing()
-    state = geo_proc.load_country_data(paths["country_file"])
-    czech_rep = geo_proc.json_to_geodataframe(state)
-    elevation_data, transform_matrix, crs = geo_proc.load_elevation_data(paths["dem_tif"])
-    return db_ops, geo_proc, czech_rep, elevation_data, transform_matrix, crs
+    artifacts = RoundArtifacts(geo_proc)
+    artifacts.refresh(config)
+    pool = create_worker_pool(config)
+    return db_ops, geo_proc, artifacts, pool
 
@@ -9,6 +9,17 @@ import logging
 
 backend_logger = logging.getLogger('backend_logger')
 
+
+def build_grid(rep, geo_proc, grid_x_points=500, grid_y_points=500):
+    bounds = rep.total_bounds
+    grid_x, grid_y = np.mgrid[
+        bounds[0]:bounds[2]:complex(grid_x_points),
+        bounds[1]:bounds[3]:complex(grid_y_points)
+    ]
+    mask = geo_proc.create_mask(rep, grid_x, grid_y)
+    return grid_x, grid_y, mask
+
+
 def spatial_interpolation(
     df,
     rep,
@@ -20,19 +31,17 @@ def spatial_interpolation(
     nlags=40,
     regression_model_type='linear',
     grid_x_points=500,
-    grid_y_points=500
+    grid_y_points=500,
+    grid=None
 ):
     backend_logger.info("spatial_interpolation start (model=%s, variogram=%s, nlags=%s)",
                         regression_model_type, variogram_model, nlags)
     try:
         rep_crs = getattr(rep, "crs", None) or "EPSG:4326"
 
-        bounds = rep.total_bounds
-        grid_x, grid_y = np.mgrid[
-            bounds[0]:bounds[2]:complex(grid_x_points),
-            bounds[1]:bounds[3]:complex(grid_y_points)
-        ]
-        mask = geo_proc.create_mask(rep, grid_x, grid_y)
+        if grid is None:
+            grid = build_grid(rep, geo_proc, grid_x_points, grid_y_points)
+        grid_x, grid_y, mask = grid
 
         valid_points = (~df['Longitude'].isna()) & (~df['Latitude'].isna()) & (~df['Predicted_Temperature'].isna())
         if valid_points.sum() < 3:
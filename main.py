@@ -1,6 +1,7 @@
 from initialization import (
     initialize_app,
-    wait_for_next_hour,
+    create_scheduler,
+    create_worker_pool,
 )
 from data_processing.data_processing import process_data_round
 from config import AppConfig
@@ -12,11 +13,49 @@ log_config = config.get_logging_config()
 backend_logger = setup_logger('backend_logger', log_config.get("backend_log"), level=log_config.get("level"))
 
 
+# Sekce, které se čtou jen při startu procesu; jejich změna se projeví až po restartu.
+RESTART_SECTIONS = {"app.logging", "database.mysql", "database.metadata"}
+
+
+def reload_config(scheduler, artifacts, pool):
+    """Načte změněnou konfiguraci a aplikuje ji; vrací (případně nový) pool pracovníků."""
+    try:
+        changed = config.reload_if_changed()
+    except Exception as e:
+        backend_logger.error(f"Config reload failed, keeping previous configuration: {e}")
+        changed = set()
+
+    try:
+        if changed:
+            backend_logger.info("Config changed: %s", ", ".join(sorted(changed)))
+        needs_restart = changed & RESTART_SECTIONS
+        if needs_restart:
+            backend_logger.warning("Changes in %s take effect only after restart.", ", ".join(sorted(needs_restart)))
+        if "app.scheduler" in changed:
+            sch = config.get_scheduler_config()
+            scheduler.reconfigure(sch["interval_minutes"] * 60, sch["overrun_policy"], sch["align"])
+        if "compute.workers" in changed:
+            # Mezi koly je pool nečinný, takže se starý jen zavře.
+            pool.shutdown(wait=True)
+            pool = create_worker_pool(config)
+            backend_logger.info("Worker pool recreated with %d workers.", config.get_worker_config()["max_workers"])
+        # Levné porovnání klíčů; znovu se sestaví jen artefakty, jejichž vstupy se změnily.
+        artifacts.refresh(config)
+    except Exception as e:
+        backend_logger.error(f"Applying changed config failed: {e}")
+    return pool
+
+
 def data_processing_loop():
-    db_ops, geo_proc, czech_rep, elevation_data, transform_matrix, crs = initialize_app(config)
-    while True:
-        process_data_round(config, db_ops, geo_proc, czech_rep, elevation_data, transform_matrix, crs)
-        wait_for_next_hour()
+    db_ops, geo_proc, artifacts, pool = initialize_app(config)
+    scheduler = create_scheduler(config)
+
+    def run_round():
+        nonlocal pool
+        pool = reload_config(scheduler, artifacts, pool)
+        process_data_round(config, db_ops, geo_proc, artifacts, pool, scheduler.slot_time)
+
+    scheduler.run_forever(run_round)
 
 
 if __name__ == "__main__":
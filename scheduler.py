@@ -0,0 +1,164 @@
+import logging
+import math
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+
+backend_logger = logging.getLogger('backend_logger')
+
+OVERRUN_POLICIES = ("skip", "coalesce", "late")
+
+
+def validate_schedule(interval_seconds, overrun_policy):
+    if interval_seconds <= 0:
+        raise ValueError("interval_seconds musí být kladný")
+    if overrun_policy not in OVERRUN_POLICIES:
+        raise ValueError(f"Neznámá overrun_policy: {overrun_policy} (povoleno: {', '.join(OVERRUN_POLICIES)})")
+
+
+def next_boundary(ts, interval_seconds):
+    """Nejbližší hranice kadence >= ts; mřížka začíná o půlnoci dne `ts` (v jeho časové zóně)."""
+    midnight = ts.replace(hour=0, minute=0, second=0, microsecond=0)
+    since_midnight = (ts - midnight).total_seconds()
+    return midnight + timedelta(seconds=math.ceil(since_midnight / interval_seconds) * interval_seconds)
+
+
+def _utc_now():
+    return datetime.now(timezone.utc)
+
+
+class RoundScheduler:
+    """
+    Spouští výpočetní kola v pevné kadenci podle monotónních deadlinů.
+
+    Deadliny se počítají jako násobky intervalu od prvního zarovnaného slotu,
+    takže se chyby ze sleep() nesčítají. Zarovnává se na mřížku od půlnoci UTC. Pokud kolo přeteče přes další slot,
+    rozhodne overrun_policy:
+      - skip:     zmeškané sloty se zahodí, čeká se na nejbližší budoucí slot,
+      - coalesce: zmeškané sloty se sloučí do jednoho kola spuštěného hned,
+                  další kola zůstávají na původní mřížce,
+      - late:     kolo se spustí hned a mřížka se posune od jeho startu.
+    """
+
+    def __init__(self, interval_seconds, overrun_policy="skip", align=True, run_immediately=True,
+                 history=100, clock=time.monotonic, sleep=time.sleep, wall_clock=_utc_now):
+        validate_schedule(interval_seconds, overrun_policy)
+
+        self.interval = float(interval_seconds)
+        self.overrun_policy = overrun_policy
+        self.align = align
+        self.run_immediately = run_immediately
+        self.clock = clock
+        self.sleep = sleep
+        self.wall_clock = wall_clock
+
+        self.lags = deque(maxlen=history)
+        self.skipped = 0
+        self.rounds = 0
+        self._next_deadline = None
+        self._scheduled_slot = None
+        self._realign = False
+        # Nástěnný čas (UTC) slotu, ke kterému patří právě běžící kolo; používá se pro pojmenování výstupů.
+        self.slot_time = None
+
+    def reconfigure(self, interval_seconds, overrun_policy, align=True):
+        """Změní kadenci a politiku za běhu; projeví se od následujícího deadline."""
+        validate_schedule(interval_seconds, overrun_policy)
+        self.interval = float(interval_seconds)
+        self.overrun_policy = overrun_policy
+        self.align = align
+        # Stará mřížka pro novou kadenci neplatí; další deadline se znovu zarovná.
+        self._realign = align
+
+    @property
+    def last_lag(self):
+        return self.lags[-1] if self.lags else None
+
+    def _seconds_to_boundary(self):
+        if not self.align:
+            return self.interval
+        now = self.wall_clock()
+        remaining = (next_boundary(now, self.interval) - now).total_seconds()
+        return remaining if remaining > 0 else self.interval
+
+    def _first_deadline(self):
+        now = self.clock()
+        if self.run_immediately:
+            return now
+        return now + self._seconds_to_boundary()
+
+    def _advance(self, deadline):
+        """Vrátí deadline dalšího kola po kole, které mělo začít v `deadline`."""
+        now = self.clock()
+        if self._realign or (self.rounds == 1 and self.run_immediately and self.align):
+            # První okamžité kolo (nebo kolo po změně kadence) neleží na mřížce, zarovná se až následující.
+            self._realign = False
+            return now + self._seconds_to_boundary()
+
+        next_deadline = deadline + self.interval
+        if now <= next_deadline:
+            return next_deadline
+
+        missed = int((now - next_deadline) // self.interval) + 1
+        if self.overrun_policy == "skip":
+            self.skipped += missed
+            backend_logger.warning(
+                "Kolo přeteklo o %.1fs, přeskakuji %d slot(ů).", now - next_deadline, missed
+            )
+            return next_deadline + missed * self.interval
+
+        if self.overrun_policy == "coalesce":
+            self.skipped += missed - 1
+            backend_logger.warning(
+                "Kolo přeteklo o %.1fs, %d zmeškaných slotů sloučeno do jednoho kola.",
+                now - next_deadline, missed
+            )
+            return next_deadline + (missed - 1) * self.interval
+
+        backend_logger.warning(
+            "Kolo přeteklo o %.1fs, další kolo se spustí se zpožděním.", now - next_deadline
+        )
+        self._scheduled_slot = next_deadline
+        return now
+
+    def wait(self):
+        """Uspí vlákno do dalšího deadline a vrátí zpoždění startu proti plánu v sekundách."""
+        if self._next_deadline is None:
+            self._next_deadline = self._first_deadline()
+
+        remaining = self._next_deadline - self.clock()
+        while remaining > 0:
+            self.sleep(remaining)
+            remaining = self._next_deadline - self.clock()
+
+        slot = self._next_deadline if self._scheduled_slot is None else self._scheduled_slot
+        self._scheduled_slot = None
+        lag = self.clock() - slot
+        self.lags.append(lag)
+
+        slot_wall = self.wall_clock() - timedelta(seconds=lag)
+        if self.align:
+            # Sekundová tolerance pohltí rozdíl mezi čtením monotónních a nástěnných hodin;
+            # kolo mimo mřížku (první okamžité, late) dostane nejbližší následující hranici.
+            self.slot_time = next_boundary(slot_wall - timedelta(seconds=1), self.interval)
+        else:
+            self.slot_time = slot_wall.replace(microsecond=0)
+        return lag
+
+    def run_once(self, job, *args, **kwargs):
+        lag = self.wait()
+        deadline = self._next_deadline
+        self.rounds += 1
+        backend_logger.info("Round %d started, lag behind schedule %.3fs.", self.rounds, lag)
+
+        try:
+            job(*args, **kwargs)
+        except Exception as e:
+            backend_logger.exception("Unhandled exception in scheduled round: %s", e)
+        finally:
+            self._next_deadline = self._advance(deadline)
+        return lag
+
+    def run_forever(self, job, *args, **kwargs):
+        while True:
+            self.run_once(job, *args, **kwargs)
@@ -1,5 +1,7 @@
 import geopandas as gpd
-from shapely.geometry import Polygon, Point
+from shapely import contains_xy
+from shapely.geometry import MultiPolygon, Polygon, shape
+from shapely.ops import unary_union
 import numpy as np
 import json
 import rasterio
@@ -10,19 +12,18 @@ class GeographicalProcessing:
         geometries = []
 
         for feature in json_data["features"]:
-            poly = Polygon(feature["geometry"]["coordinates"][0])
-            geometries.append(poly)
+            geom = shape(feature["geometry"])
+            if not isinstance(geom, (Polygon, MultiPolygon)):
+                raise ValueError(f"Nepodporovaný typ geometrie: {geom.geom_type}")
+            geometries.append(geom)
 
         gdf = gpd.GeoDataFrame(geometry=geometries, crs="EPSG:4326")
         return gdf
 
     def create_mask(self, czech_rep, grid_x, grid_y):
-        mask = np.zeros_like(grid_x, dtype=bool)
-        for i in range(grid_x.shape[0]):
-            for j in range(grid_x.shape[1]):
-                point = Point(grid_x[i, j], grid_y[i, j])
-                mask[i, j] = czech_rep.contains(point).any()
-        return mask
+        # Jeden vektorový dotaz nad sjednocením polygonů místo Point.contains pro každý bod mřížky.
+        region = unary_union(czech_rep.geometry.values)
+        return contains_xy(region, grid_x, grid_y)
 
     def load_country_data(self, country_file_path):
         with open(country_file_path, "r", encoding="utf-8") as file:
@@ -0,0 +1,49 @@
+import os
+import shutil
+
+import pytest
+
+from config import AppConfig
+
+CONFIG_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "configs")
+
+
+@pytest.fixture
+def config_dir(tmp_path):
+    target = tmp_path / "configs"
+    shutil.copytree(CONFIG_DIR, target)
+    return target
+
+
+def edit(path, old, new):
+    text = path.read_text(encoding="utf-8")
+    assert old in text
+    path.write_text(text.replace(old, new), encoding="utf-8")
+    # Posun mtime, aby změnu poznal i souborový systém s hrubým rozlišením času.
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+
+def test_reload_reports_changed_sections(config_dir):
+    config = AppConfig(str(config_dir))
+    assert config.reload_if_changed() == set()
+
+    edit(config_dir / "compute.ini.dist", "x_points = 500", "x_points = 300")
+    assert config.reload_if_changed() == {"compute.grid"}
+    assert config.get_grid_config()["x_points"] == 300
+
+
+@pytest.mark.parametrize("old, new", [
+    ("interval_minutes = 60", "interval_minutes = 0"),
+    ("overrun_policy = skip", "overrun_policy = skipp"),
+    ("[ml]", "[ml"),
+])
+def test_invalid_reload_keeps_previous_config(config_dir, old, new):
+    config = AppConfig(str(config_dir))
+    edit(config_dir / "app.ini.dist", old, new)
+
+    with pytest.raises(Exception):
+        config.reload_if_changed()
+    assert config.get_scheduler_config()["interval_minutes"] == 60
+    assert config.get_scheduler_config()["overrun_policy"] == "skip"
+    assert config.get_ml()["lstm_path"] == "neural/best_lstm_new.keras"
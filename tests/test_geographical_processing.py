@@ -0,0 +1,58 @@
+import numpy as np
+from shapely.geometry import MultiPolygon, Point, Polygon
+
+from spatial_processing.geographical_processing import GeographicalProcessing
+
+
+def square(x0, y0, x1, y1):
+    return [[x0, y0], [x1, y0], [x1, y1], [x0, y1], [x0, y0]]
+
+
+def feature(geometry_type, coordinates):
+    return {"type": "Feature", "properties": {}, "geometry": {"type": geometry_type, "coordinates": coordinates}}
+
+
+STATE = {
+    "type": "FeatureCollection",
+    "features": [
+        # Čtverec s dírou, na hranici x = 4 sousedí s dalším polygonem.
+        feature("Polygon", [square(0, 0, 4, 4), square(1, 1, 3, 3)]),
+        feature("Polygon", [square(4, 0, 6, 4)]),
+        feature("MultiPolygon", [[square(10, 0, 11, 1)], [square(12, 0, 13, 1)]]),
+    ],
+}
+
+POINTS = {
+    "inside": ((0.5, 0.5), True),
+    "hole": ((2, 2), False),
+    "shared_border": ((4, 2), True),
+    "multipolygon_second_part": ((12.5, 0.5), True),
+    "between_multipolygon_parts": ((11.5, 0.5), False),
+    "outside": ((8, 2), False),
+}
+
+
+def test_json_to_geodataframe_keeps_holes_and_multipolygons():
+    gdf = GeographicalProcessing().json_to_geodataframe(STATE)
+    assert gdf.crs.to_epsg() == 4326
+    assert isinstance(gdf.geometry[0], Polygon) and len(gdf.geometry[0].interiors) == 1
+    assert isinstance(gdf.geometry[2], MultiPolygon) and len(gdf.geometry[2].geoms) == 2
+
+
+def test_create_mask_on_known_points():
+    geo_proc = GeographicalProcessing()
+    gdf = geo_proc.json_to_geodataframe(STATE)
+    names = list(POINTS)
+    grid_x = np.array([[POINTS[n][0][0] for n in names]], dtype=float)
+    grid_y = np.array([[POINTS[n][0][1] for n in names]], dtype=float)
+
+    mask = geo_proc.create_mask(gdf, grid_x, grid_y)
+    assert mask.shape == grid_x.shape
+    assert dict(zip(names, mask[0].tolist())) == {n: expected for n, (_, expected) in POINTS.items()}
+
+
+def test_shared_border_is_inside_union_but_not_any_single_polygon():
+    gdf = GeographicalProcessing().json_to_geodataframe(STATE)
+    # Původní maska testovala každý polygon zvlášť, bod na společné hranici v žádném z nich neleží.
+    assert not gdf.contains(Point(4, 2)).any()
+    assert GeographicalProcessing().create_mask(gdf, np.array([[4.0]]), np.array([[2.0]]))[0, 0]
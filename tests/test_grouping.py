@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_processing.grouping import GROUP_COLUMNS, group_key, median_by_key
+
+CATEGORICAL = ["IP", "Technology", "Side", "Link_ID"]
+
+
+def make_frame(n=3000, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "Hour": rng.integers(0, 3, n).astype(np.int16),
+        "IP": pd.Categorical([f"10.0.{i % 40}.{i % 7}" for i in range(n)]),
+        "Latitude": (48.5 + rng.integers(0, 30, n) / 10).astype(np.float32),
+        "Longitude": (12.0 + rng.integers(0, 30, n) / 10).astype(np.float32),
+        "Technology": pd.Categorical(rng.choice(["1s10", "summit", "summit_bt"], n)),
+        "Side": pd.Categorical(rng.choice(["A", "B"], n)),
+        "Elevation": np.where(rng.random(n) < 0.05, np.nan, rng.integers(200, 205, n)).astype(np.float32),
+        "Link_ID": pd.Categorical(rng.integers(0, 50, n)),
+        "Time": pd.to_datetime(rng.integers(0, 3, n) * 600, unit="s", utc=True),
+        "Predicted_Temperature": rng.random(n).astype(np.float32),
+    })
+
+
+def test_median_by_key_matches_groupby():
+    df = make_frame()
+    expected = (
+        df.astype({c: "object" for c in CATEGORICAL})
+        .groupby(GROUP_COLUMNS)["Predicted_Temperature"].median()
+        .reset_index()
+    )
+    result = median_by_key(df, GROUP_COLUMNS, "Predicted_Temperature")
+
+    assert len(result) == len(expected)
+    assert df["Elevation"].isna().any()
+    for col in GROUP_COLUMNS:
+        np.testing.assert_array_equal(result[col].astype(object).to_numpy(), expected[col].to_numpy())
+    np.testing.assert_allclose(result["Predicted_Temperature"], expected["Predicted_Temperature"], rtol=1e-6)
+
+
+def test_group_key_marks_missing_and_survives_wide_keys():
+    n = 1000
+    # Dvacet sloupců po 1000 hodnotách by bez přečíslování přeteklo int64.
+    df = pd.DataFrame({f"c{i}": np.arange(n) for i in range(20)})
+    df.loc[5, "c3"] = np.nan
+    key = group_key(df, list(df.columns))
+
+    assert key[5] == -1
+    valid = np.delete(key, 5)
+    assert (valid >= 0).all()
+    assert len(np.unique(valid)) == n - 1
+
+
+@pytest.mark.parametrize("col", ["Side", "Elevation"])
+def test_single_key_groups(col):
+    df = make_frame(200)
+    expected = df.dropna(subset=[col]).astype({c: "object" for c in CATEGORICAL})[col].nunique()
+    assert len(median_by_key(df, [col], "Predicted_Temperature")) == expected
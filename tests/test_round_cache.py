@@ -0,0 +1,69 @@
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from config import AppConfig
+from data_processing.round_cache import RoundCache, compute_fingerprint, render_key
+
+CONFIG_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "configs")
+
+
+@pytest.fixture
+def config_dir(tmp_path):
+    target = tmp_path / "configs"
+    shutil.copytree(CONFIG_DIR, target)
+    return target
+
+
+def edit(path, old, new):
+    text = path.read_text(encoding="utf-8")
+    assert old in text
+    path.write_text(text.replace(old, new), encoding="utf-8")
+
+
+def frame():
+    return pd.DataFrame({"IP": ["10.0.0.1", "10.0.0.2"], "Temperature_MW": [20.5, 21.0]})
+
+
+def test_visualization_change_keeps_compute_fingerprint(config_dir):
+    config = AppConfig(str(config_dir))
+    fingerprint, rendered = compute_fingerprint(frame(), config), render_key(config)
+
+    edit(config_dir / "app.ini.dist", "n_levels = 15", "n_levels = 20")
+    config = AppConfig(str(config_dir))
+    assert compute_fingerprint(frame(), config) == fingerprint
+    assert render_key(config) != rendered
+
+    edit(config_dir / "compute.ini.dist", "x_points = 500", "x_points = 300")
+    config = AppConfig(str(config_dir))
+    assert compute_fingerprint(frame(), config) != fingerprint
+
+
+def test_polygon_file_change_invalidates_fingerprint(config_dir, tmp_path):
+    country = tmp_path / "country.json"
+    country.write_text('{"features": []}', encoding="utf-8")
+    edit(config_dir / "app.ini.dist", "country_file = country_data/czech_republic.json\n",
+         f"country_file = {country}\n")
+    config = AppConfig(str(config_dir))
+    fingerprint = compute_fingerprint(frame(), config)
+
+    country.write_text('{"features": [{}]}', encoding="utf-8")
+    assert compute_fingerprint(frame(), config) != fingerprint
+
+
+def test_store_load_and_mark_rendered(tmp_path):
+    cache = RoundCache(str(tmp_path / "cache"), max_entries=2)
+    grid = np.arange(6, dtype=float).reshape(2, 3)
+    cache.store("abc", {"cz": (grid, grid + 1, grid + 2)}, "render-1")
+
+    grids, rendered = cache.load("abc")
+    assert rendered == "render-1"
+    np.testing.assert_array_equal(grids["cz"][2], grid + 2)
+    assert not os.path.exists(tmp_path / "cache" / "abc" / "predictions.pkl")
+
+    cache.mark_rendered("abc", "render-2")
+    assert cache.load("abc")[1] == "render-2"
+    assert cache.load("missing") is None
@@ -0,0 +1,124 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from scheduler import RoundScheduler
+
+MIDNIGHT = datetime(2026, 10, 19, tzinfo=timezone.utc)
+
+
+class FakeClock:
+    """Monotónní i nástěnné hodiny; čas 0 odpovídá půlnoci UTC (plus `offset` sekund)."""
+
+    def __init__(self, offset=0.0):
+        self.now = 0.0
+        self.offset = offset
+
+    def __call__(self):
+        return self.now
+
+    def wall(self):
+        return MIDNIGHT + timedelta(seconds=self.offset + self.now)
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def run_rounds(policy, durations, interval=600):
+    clock = FakeClock()
+    scheduler = RoundScheduler(interval, policy, align=False, clock=clock, sleep=clock.sleep)
+    starts = []
+    durations = iter(durations)
+
+    def job():
+        starts.append(clock.now)
+        clock.now += next(durations)
+
+    for _ in range(6):
+        scheduler.run_once(job)
+    return scheduler, starts
+
+
+DURATIONS = [10, 10, 1500, 10, 10, 10]
+
+
+def test_unaligned_deadlines_count_from_round_start():
+    _, starts = run_rounds("skip", [10] * 6)
+    assert starts == [0, 600, 1200, 1800, 2400, 3000]
+
+
+def test_skip_drops_missed_slots():
+    scheduler, starts = run_rounds("skip", DURATIONS)
+    # Kolo v 1200 skončí v 2700, sloty 1800 a 2400 se zahodí.
+    assert starts == [0, 600, 1200, 3000, 3600, 4200]
+    assert scheduler.skipped == 2
+    assert list(scheduler.lags) == [0] * 6
+
+
+def test_coalesce_runs_once_immediately_and_keeps_grid():
+    scheduler, starts = run_rounds("coalesce", DURATIONS)
+    assert starts == [0, 600, 1200, 2700, 3000, 3600]
+    assert scheduler.skipped == 1
+    assert list(scheduler.lags) == [0, 0, 0, 300, 0, 0]
+
+
+def test_late_runs_immediately_and_shifts_grid():
+    scheduler, starts = run_rounds("late", DURATIONS)
+    assert starts == [0, 600, 1200, 2700, 3300, 3900]
+    assert scheduler.skipped == 0
+    assert list(scheduler.lags) == [0, 0, 0, 900, 0, 0]
+
+
+@pytest.mark.parametrize("interval, policy", [(0, "skip"), (600, "skipp")])
+def test_invalid_settings_rejected(interval, policy):
+    with pytest.raises(ValueError):
+        RoundScheduler(interval, policy)
+
+
+def test_cadence_change_realigns_to_new_boundary():
+    clock = FakeClock(offset=5)
+    scheduler = RoundScheduler(600, "skip", align=True, clock=clock, sleep=clock.sleep, wall_clock=clock.wall)
+    starts = []
+
+    def job():
+        starts.append(clock.offset + clock.now)
+        if len(starts) == 2:
+            # Hot reload během kola: z 10 na 60 minut.
+            scheduler.reconfigure(3600, "skip", align=True)
+        clock.now += 10
+
+    for _ in range(4):
+        scheduler.run_once(job)
+    # Po změně kadence kola padají na celé hodiny, ne na hh:10.
+    assert starts == [5, 600, 3600, 7200]
+
+
+def test_enabling_align_on_reconfigure_snaps_to_boundary():
+    clock = FakeClock(offset=5)
+    scheduler = RoundScheduler(600, "skip", align=False, clock=clock, sleep=clock.sleep, wall_clock=clock.wall)
+    starts = []
+
+    def job():
+        starts.append(clock.offset + clock.now)
+        if len(starts) == 2:
+            scheduler.reconfigure(600, "skip", align=True)
+        clock.now += 10
+
+    for _ in range(4):
+        scheduler.run_once(job)
+    assert starts == [5, 605, 1200, 1800]
+
+
+def test_slot_time_follows_cadence_grid():
+    clock = FakeClock(offset=3 * 3600 + 37 * 60)
+    scheduler = RoundScheduler(90 * 60, "skip", align=True, clock=clock, sleep=clock.sleep, wall_clock=clock.wall)
+    slots = []
+
+    def job():
+        slots.append(scheduler.slot_time)
+        clock.now += 10
+
+    for _ in range(3):
+        scheduler.run_once(job)
+    # Mřížka 90 minut od půlnoci UTC: okamžité kolo v 03:37 dostane 04:30, dál 04:30 a 06:00.
+    assert [t.strftime("%H%M") for t in slots] == ["0430", "0430", "0600"]
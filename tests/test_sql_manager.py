@@ -0,0 +1,87 @@
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.pool import StaticPool
+
+from database_operations.sql_manager import DatabaseOperations
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def engine():
+    # SQLite v paměti se schématem cml_metadata připojeným přes ATTACH, aby prošel dotaz z produkce.
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+
+    @event.listens_for(engine, "connect")
+    def attach(dbapi_conn, _):
+        dbapi_conn.execute("ATTACH DATABASE ':memory:' AS cml_metadata")
+
+    with engine.begin() as conn:
+        conn.execute(text("""
+            CREATE TABLE cml_metadata.links (
+                ID INTEGER PRIMARY KEY, technology TEXT,
+                IP_address_A TEXT, IP_address_B TEXT, site_A INTEGER, site_B INTEGER,
+                azimuth_A REAL, azimuth_B REAL
+            )
+        """))
+        conn.execute(text("CREATE TABLE cml_metadata.sites (id INTEGER PRIMARY KEY, X_coordinate REAL, Y_coordinate REAL)"))
+        conn.execute(text("INSERT INTO cml_metadata.sites VALUES (1, 14.4, 50.1), (2, 16.6, 49.2)"))
+        conn.execute(text("""
+            INSERT INTO cml_metadata.links VALUES
+                (10, '1s10', '10.0.0.1', '10.0.0.2', 1, 2, 90, 270),
+                (11, 'summit', '10.0.0.3', '10.0.0.4', 2, 1, 45, 225)
+        """))
+    return engine
+
+
+def frame(*ips):
+    return pd.DataFrame({"IP": list(ips), "Temperature_MW": [20.0] * len(ips)})
+
+
+def test_refresh_evicts_ips_removed_from_db(engine):
+    db_ops = DatabaseOperations(engine)
+    db_ops.get_metadata(frame("10.0.0.1", "10.0.0.3"))
+    assert db_ops.known_ips == {"10.0.0.1", "10.0.0.3"}
+
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM cml_metadata.links WHERE ID = 11"))
+
+    refreshed = db_ops.fetch_metadata(sorted(db_ops.known_ips), evict_missing=True)
+    assert set(refreshed) == {"10.0.0.1"}
+    assert db_ops.known_ips == {"10.0.0.1"}
+    assert "10.0.0.3" not in db_ops._ip_meta_cache
+
+    lat, lon, az, links, tech, sides = db_ops.get_metadata(frame("10.0.0.1", "10.0.0.3"))
+    assert links == [10]
+
+
+def test_refresh_without_evict_keeps_cache(engine):
+    db_ops = DatabaseOperations(engine)
+    db_ops.get_metadata(frame("10.0.0.3"))
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM cml_metadata.links WHERE ID = 11"))
+
+    db_ops.fetch_metadata(["10.0.0.3"])
+    assert "10.0.0.3" in db_ops._ip_meta_cache
+
+
+def test_known_ips_expire_after_ttl(engine):
+    clock = FakeClock()
+    db_ops = DatabaseOperations(engine, known_ip_ttl=3600, clock=clock)
+    db_ops.get_metadata(frame("10.0.0.1", "10.0.0.2"))
+
+    clock.now = 1800
+    db_ops.get_metadata(frame("10.0.0.1"))
+    assert db_ops.known_ips == {"10.0.0.1", "10.0.0.2"}
+
+    clock.now = 3600
+    db_ops.get_metadata(frame("10.0.0.1"))
+    assert db_ops.known_ips == {"10.0.0.1"}
+    assert "10.0.0.2" not in db_ops._ip_meta_cache